@@ -6,22 +6,33 @@ and integrates with backend services for scraping (FireCrawl, Crawl4AI) and
 LLM inference. It also initializes and uses Langfuse for tracing application performance.
 """
 
+import asyncio
+import random
+import re
+import threading
 import gradio as gr
+from cachetools import TTLCache
 import firecrawl_client
 import crawl4ai_client
 import llm_inference_service
-from config import LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, LANGFUSE_HOST
-from langfuse import Langfuse, get_client
-
-# Initialize Langfuse if configured
-langfuse = None
-if LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY:
-    Langfuse(
-        public_key=LANGFUSE_PUBLIC_KEY, 
-        secret_key=LANGFUSE_SECRET_KEY, 
-        host=LANGFUSE_HOST
-    )
-    langfuse = get_client()
+from config import LANGFUSE_SAMPLE_RATE
+from tracing import get_langfuse
+
+# The shared Langfuse client (None if tracing is not configured).
+langfuse = get_langfuse()
+
+def _bg_flush():
+    """
+    Flushes queued Langfuse events on a background daemon thread.
+
+    This keeps trace export off the user-facing critical path: the Gradio
+    handler returns immediately even if the Langfuse backend is slow.
+    """
+    if langfuse:
+        threading.Thread(target=langfuse.flush, daemon=True).start()
+
+# Matches "<model_name> (<provider>)" as used by the model dropdown choices.
+_MODEL_PROVIDER_PATTERN = re.compile(r"^(.+?)\s*\(([^)]+)\)\s*$")
 
 def parse_model_provider(selection):
     """
@@ -38,18 +49,17 @@ def parse_model_provider(selection):
     Raises:
         ValueError: If the selection string is not in the expected format.
     """
-    if "(" in selection and ")" in selection:
-        model = selection.split(" (")[0].strip()
-        provider = selection.split(" (")[1].replace(")", "").strip()
-        return model, provider
-    raise ValueError(f"Invalid selection format: {selection}")
+    match = _MODEL_PROVIDER_PATTERN.match(selection)
+    if not match:
+        raise ValueError(f"Invalid selection format: {selection}")
+    return match.group(1).strip(), match.group(2).strip()
     
 def llm_response_wrapper(query, scrape_result, model_provider_selection, progress=gr.Progress(track_tqdm=True)):
     """
     A generator function that wraps the LLM inference call for the Gradio UI.
 
-    It yields an initial status message, calls the LLM service to extract information,
-    and then yields the final result or an error message.
+    It yields an initial status message, then streams the LLM's response as it
+    is generated, and finally yields an error message if nothing was extracted.
 
     Args:
         query (str): The user's query for information extraction.
@@ -58,61 +68,158 @@ def llm_response_wrapper(query, scrape_result, model_provider_selection, progres
         progress (gr.Progress, optional): Gradio progress tracker. Defaults to gr.Progress(track_tqdm=True).
 
     Yields:
-        str: Status messages and the final LLM response as a markdown string.
+        str: Status messages and the LLM response as an incrementally growing markdown string.
     """
     yield "⏳ Generating response... Please wait."
-    
+
     model, provider = parse_model_provider(model_provider_selection)
-    result = llm_inference_service.extract_page_info_by_llm(query, scrape_result, model, provider)
-    if not result or (isinstance(result, str) and result.strip() == ""):
+    result = ""
+    for piece in llm_inference_service.extract_page_info_by_llm_stream(query, scrape_result, model, provider):
+        result += piece
+        yield result
+    if not result or result.strip() == "":
         yield "❌ <span style='color:red;'>No information could be extracted from the scraped content. Please check your query or try a different model/provider.</span>"
-    yield result
 
-async def scrape_website(url, scraper_selection, progress=gr.Progress(track_tqdm=True)):
-    """An async generator that scrapes a website based on user selection for the Gradio UI.
+# Maximum number of URLs scraped concurrently in a single batch.
+MAX_SCRAPE_CONCURRENCY = 5
 
-    This function yields an initial status message, then performs the web scraping
-    using the selected tool (FireCrawl or Crawl4AI). If Langfuse is configured,
-    it wraps the scraping operation in a trace for observability.
+# Recently scraped pages keyed by (scraper, url), so re-clicking Scrape on the
+# same URL skips the whole network/browser path while the entry is fresh.
+_scrape_cache = TTLCache(maxsize=256, ttl=600)
+_scrape_cache_lock = asyncio.Lock()
+
+async def _scrape_single(url, scraper_selection, semaphore):
+    """
+    Scrapes a single URL with the selected tool, bounded by the shared semaphore.
+
+    Fresh results from the TTL cache are returned without hitting the network.
+    The synchronous FireCrawl client is pushed to a worker thread so it does not
+    block the event loop and concurrent scrapes can actually overlap.
 
     Args:
         url (str): The URL of the website to scrape.
         scraper_selection (str): The scraping tool selected by the user.
-        progress (gr.Progress, optional): Gradio progress tracker. Defaults to gr.Progress(track_tqdm=True).
+        semaphore (asyncio.Semaphore): Limits how many scrapes run at once.
 
-    Yields:
-        str: A status message, followed by the scraped markdown content or an error message.
+    Returns:
+        tuple[str, str]: The URL and its scraped markdown content (or a formatted
+                         error message string if scraping failed).
     """
-    # 1. First, yield an update to show the loading state and hide the old image.
-    yield "⏳ Scraping website... Please wait."
+    cache_key = (scraper_selection, url)
+    async with _scrape_cache_lock:
+        cached = _scrape_cache.get(cache_key)
+    if cached is not None:
+        return url, cached
 
-    markdown = ""
-    if not langfuse:
+    async with semaphore:
         try:
             if scraper_selection == "Scrape with FireCrawl":
-                markdown = firecrawl_client.scrape_and_get_markdown_with_firecrawl(url)
+                markdown = await asyncio.to_thread(firecrawl_client.scrape_and_get_markdown_with_firecrawl, url)
             elif scraper_selection == "Scrape with Crawl4AI":
                 markdown = await crawl4ai_client.scrape_and_get_markdown_with_crawl4ai(url)
             else:
                 markdown = "❌ <span style='color:red;'>Invalid scraper selected.</span>"
         except Exception as e:
             markdown = f"❌ <span style='color:red;'>An unexpected error occurred: {e}</span>"
-        yield markdown
+        # Only successful scrapes are cached; error messages should be retried.
+        if not markdown.startswith("❌"):
+            async with _scrape_cache_lock:
+                _scrape_cache[cache_key] = markdown
+        return url, markdown
+
+def _merge_markdown(url_list, results):
+    """
+    Merges per-URL markdown results into a single string in input order.
+
+    Args:
+        url_list (list[str]): The URLs in the order the user entered them.
+        results (dict[str, str]): Mapping of URL to its scraped markdown so far.
+
+    Returns:
+        str: The combined markdown. A single URL is returned as-is; with multiple
+             URLs each result is placed under a header so it stays attributable.
+    """
+    if len(url_list) == 1:
+        return results.get(url_list[0], "")
+    sections = []
+    for url in url_list:
+        if url in results:
+            sections.append(f"### {url}\n\n{results[url]}")
+    return "\n\n--------------\n\n".join(sections)
+
+async def _scrape_all(url_list, scraper_selection):
+    """
+    An async generator that scrapes a list of URLs concurrently.
+
+    All URLs are dispatched at once (bounded by MAX_SCRAPE_CONCURRENCY) and the
+    merged markdown is yielded again each time another URL completes, so the UI
+    shows partial results while the rest are still in flight.
+
+    Args:
+        url_list (list[str]): The URLs to scrape.
+        scraper_selection (str): The scraping tool selected by the user.
+
+    Yields:
+        str: The merged markdown of all URLs that have completed so far.
+    """
+    # FireCrawl offers a native batch endpoint: one job submission beats
+    # fanning out individual scrape calls, so prefer it for multi-URL jobs.
+    if scraper_selection == "Scrape with FireCrawl" and len(url_list) > 1:
+        yield await asyncio.to_thread(firecrawl_client.scrape_and_get_markdown_batch_with_firecrawl, url_list)
+        return
+
+    semaphore = asyncio.Semaphore(MAX_SCRAPE_CONCURRENCY)
+    tasks = [asyncio.create_task(_scrape_single(url, scraper_selection, semaphore)) for url in url_list]
+    results = {}
+    for finished in asyncio.as_completed(tasks):
+        url, markdown = await finished
+        results[url] = markdown
+        yield _merge_markdown(url_list, results)
+
+async def scrape_website(urls, scraper_selection, progress=gr.Progress(track_tqdm=True)):
+    """An async generator that scrapes one or more websites for the Gradio UI.
+
+    This function accepts a newline-separated list of URLs, scrapes them
+    concurrently using the selected tool (FireCrawl or Crawl4AI), and yields
+    the merged markdown as each URL completes. If Langfuse is configured,
+    it wraps the scraping operation in a trace for observability.
+
+    Args:
+        urls (str): One or more URLs to scrape, separated by newlines.
+        scraper_selection (str): The scraping tool selected by the user.
+        progress (gr.Progress, optional): Gradio progress tracker. Defaults to gr.Progress(track_tqdm=True).
+
+    Yields:
+        str: A status message, followed by the merged scraped markdown content
+             (updated as each URL finishes) or an error message.
+    """
+    # 1. First, yield an update to show the loading state and hide the old image.
+    yield "⏳ Scraping website(s)... Please wait."
+
+    url_list = [u.strip() for u in urls.splitlines() if u.strip()]
+    if not url_list:
+        yield "❌ <span style='color:red;'>Please enter at least one URL to scrape.</span>"
+        return
+
+    markdown = ""
+    # Head-based sampling: only a LANGFUSE_SAMPLE_RATE fraction of requests is
+    # traced, so tracing overhead scales down under load.
+    if not langfuse or random.random() >= LANGFUSE_SAMPLE_RATE:
+        async for markdown in _scrape_all(url_list, scraper_selection):
+            yield markdown
         return
 
-    with langfuse.start_as_current_span(name="web-scraping", input={"url": url, "scraper": scraper_selection}) as span:
+    with langfuse.start_as_current_span(name="web-scraping", input={"urls": url_list, "scraper": scraper_selection}) as span:
         try:
-            if scraper_selection == "Scrape with FireCrawl":
-                markdown = firecrawl_client.scrape_and_get_markdown_with_firecrawl(url)
-            elif scraper_selection == "Scrape with Crawl4AI":
-                markdown = await crawl4ai_client.scrape_and_get_markdown_with_crawl4ai(url)
-            else:
-                markdown = "❌ <span style='color:red;'>Invalid scraper selected.</span>"
+            async for markdown in _scrape_all(url_list, scraper_selection):
+                yield markdown
             span.update_trace(output={"markdown_char_count": len(markdown), "status": "Success"})
         except Exception as e:
             markdown = f"❌ <span style='color:red;'>An unexpected error occurred: {e}</span>"
             span.update_trace(output={"error": str(e), "status": "Error"})
-        yield markdown
+            yield markdown
+        finally:
+            _bg_flush()
 
 #Gradio UI
 # This block defines the entire Gradio user interface, including layout and component interactions.
@@ -199,7 +306,7 @@ with gr.Blocks() as gradio_ui:
             </p>
         </div>
         """)
-        url_input = gr.Textbox(label="Enter URL to scrape", placeholder="https://example.com/query?search=cat+food", autofocus=True)
+        url_input = gr.Textbox(label="Enter URL(s) to scrape (one per line)", placeholder="https://example.com/query?search=cat+food", lines=2, autofocus=True)
         query_input = gr.Textbox(label="What information do you want to find?", placeholder="Find product name, price, rating etc. / Summarize the content of this page")
         
         with gr.Row():
@@ -267,4 +374,7 @@ with gr.Blocks() as gradio_ui:
     
     cancel_btn.click(fn=lambda: None, inputs=None, outputs=None, cancels=[scrape_event, llm_event])
 
-gradio_ui.launch(server_name="0.0.0.0")
+# Allow multiple scrape/LLM requests in flight at once; they are mostly
+# I/O-bound on external APIs, so the default single-event queue serializes
+# work unnecessarily.
+gradio_ui.queue(default_concurrency_limit=8, max_size=64).launch(server_name="0.0.0.0")
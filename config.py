@@ -24,6 +24,8 @@ FIRE_CRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com") # Default to cloud
+FIRECRAWL_BATCH_SIZE = int(os.getenv("FIRECRAWL_BATCH_SIZE", "5")) # Max URLs per FireCrawl batch scrape job
+LANGFUSE_SAMPLE_RATE = float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0")) # Fraction of scrape requests traced (0.0-1.0)
 
 if not GOOGLE_API_KEY:
     print("⚠️ Warning: GOOGLE_API_KEY is not set. Gemini LLM API may fail.")
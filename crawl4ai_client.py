@@ -5,7 +5,70 @@ It encapsulates the logic for scraping a website using Crawl4AI and extracting
 its content as a markdown string, handling potential errors during the process.
 """
 
-from crawl4ai import AsyncWebCrawler
+import asyncio
+import atexit
+from typing import Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
+
+# A lean headless browser profile shared by every crawl; built once instead of
+# letting each crawl fall back to the heavier defaults.
+_BROWSER_CONFIG = BrowserConfig(headless=True, viewport_width=1280, viewport_height=720, browser_type="chromium")
+
+# Per-crawl settings: cache fetched pages so repeat visits to the same host
+# skip the network, and bound how long a single page may take to load.
+_RUN_CONFIG = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, page_timeout=30000)
+
+# A single shared crawler instance so the Chromium browser is launched once
+# and reused across requests instead of paying the cold-start cost per URL.
+# The loop that started the crawler is remembered because Playwright's
+# connection can only be awaited from its owning loop.
+_crawler: Optional[AsyncWebCrawler] = None
+_crawler_loop: Optional[asyncio.AbstractEventLoop] = None
+_crawler_lock = asyncio.Lock()
+
+
+async def _get_crawler() -> AsyncWebCrawler:
+    """
+    Returns the shared AsyncWebCrawler, starting it lazily on first use.
+
+    The lock ensures only one coroutine launches the browser when concurrent
+    scrapes race on a cold start.
+
+    Returns:
+        AsyncWebCrawler: The started, shared crawler instance.
+    """
+    global _crawler, _crawler_loop
+    async with _crawler_lock:
+        if _crawler is None:
+            crawler = AsyncWebCrawler(config=_BROWSER_CONFIG)
+            await crawler.__aenter__()
+            _crawler = crawler
+            _crawler_loop = asyncio.get_running_loop()
+    return _crawler
+
+
+def _close_crawler():
+    """
+    Closes the shared crawler (and its browser) at interpreter shutdown.
+
+    The crawler belongs to the server's event loop, and Playwright's
+    connection cannot be awaited from any other loop. If that loop is still
+    running the close is scheduled onto it; once it has stopped (the usual
+    case at atexit) the close is skipped, since the browser process dies with
+    the interpreter anyway. Any error is swallowed so shutdown stays clean.
+    """
+    if _crawler is None or _crawler_loop is None:
+        return
+    try:
+        if _crawler_loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(_crawler.__aexit__(None, None, None), _crawler_loop)
+            future.result(timeout=10)
+    except Exception:
+        pass
+
+
+atexit.register(_close_crawler)
 
 
 async def scrape_and_get_markdown_with_crawl4ai(url: str) -> str:
@@ -20,14 +83,14 @@ async def scrape_and_get_markdown_with_crawl4ai(url: str) -> str:
              no content, a formatted error message string is returned.
     """
     try:
-        async with AsyncWebCrawler() as crawler:
-            result = await crawler.arun(url=url) 
+        crawler = await _get_crawler()
+        result = await crawler.arun(url=url, config=_RUN_CONFIG)
+
+        markdown_content = "❌ <span style='color:red;'>Crawl4AI completed but returned no content. The page might be empty or inaccessible.</span>"
 
-            markdown_content = "❌ <span style='color:red;'>Crawl4AI completed but returned no content. The page might be empty or inaccessible.</span>"
+        if result and result.markdown:
+            markdown_content = result.markdown
 
-            if result and result.markdown:
-                markdown_content = result.markdown
-            
-            return markdown_content
+        return markdown_content
     except Exception as e:
         return f"❌ <span style='color:red;'>An error occurred while scraping with Crawl4AI: {e}</span>"
\ No newline at end of file
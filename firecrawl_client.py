@@ -1,20 +1,44 @@
 """
 This module provides a client for interacting with the FireCrawl service.
 
-It encapsulates the logic for scraping a website using the FireCrawlLoader from
-LangChain, converting the scraped documents into a single markdown string, and
-handling potential errors during the process.
+It encapsulates the logic for scraping a website via the FireCrawl REST API,
+converting the scraped documents into a single markdown string, and handling
+potential errors during the process.
 """
 
-from langchain_community.document_loaders import FireCrawlLoader
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain_core.documents import Document
-from config import FIRE_CRAWL_API_KEY
+from config import FIRE_CRAWL_API_KEY, FIRECRAWL_BATCH_SIZE
+
+FIRECRAWL_API_BASE_URL = "https://api.firecrawl.dev/v1"
+# Seconds to wait between polls of a batch scrape job's status.
+BATCH_POLL_INTERVAL_SECONDS = 2
+# Give up on a batch scrape job that has not finished within this long.
+BATCH_POLL_TIMEOUT_SECONDS = 300
+# Job statuses that mean the batch will never complete.
+BATCH_TERMINAL_FAILURE_STATUSES = ("failed", "cancelled")
+
+# A shared session so all FireCrawl API calls reuse pooled TCP/TLS connections
+# instead of paying a fresh handshake per request.
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.3)),
+)
+_session.headers.update({"Authorization": f"Bearer {FIRE_CRAWL_API_KEY}"})
 
 
 def scrape_with_firecrawl(url: str) -> list[Document]:
     """
     Scrapes a given URL using FireCrawl and returns the content as a list of Documents.
 
+    The request goes through the shared session, so repeated scrapes reuse the
+    same TLS connection to api.firecrawl.dev.
+
     Args:
         url (str): The URL of the website to scrape.
 
@@ -22,16 +46,66 @@ def scrape_with_firecrawl(url: str) -> list[Document]:
         list[Document]: A list of LangChain Document objects, where each document
                         represents a scraped page.
     """
-    loader = FireCrawlLoader(url=url,
-                             api_key=FIRE_CRAWL_API_KEY,
-                             mode='scrape')
-    
-    pages = []
+    response = _session.post(
+        f"{FIRECRAWL_API_BASE_URL}/scrape",
+        json={"url": url, "formats": ["markdown"]},
+    )
+    response.raise_for_status()
+
+    data = response.json().get("data", {})
+    markdown = data.get("markdown")
+    if not markdown:
+        return []
+
+    return [Document(page_content=markdown)]
+
+def scrape_batch_with_firecrawl(urls: list[str]) -> list[Document]:
+    """
+    Scrapes multiple URLs in one job using FireCrawl's batch scrape API.
+
+    URLs are submitted in chunks of FIRECRAWL_BATCH_SIZE to the /batch/scrape
+    endpoint, and each job is polled until completion. This replaces N client
+    round-trips with one submission per chunk plus server-side parallelism.
 
-    for page in loader.lazy_load():  # type: ignore
-        pages.append(page)
-        
-    return pages
+    Args:
+        urls (list[str]): The URLs of the websites to scrape.
+
+    Returns:
+        list[Document]: A list of LangChain Document objects, one per scraped page.
+
+    Raises:
+        RuntimeError: If a batch job ends as failed or cancelled.
+        TimeoutError: If a batch job does not complete within BATCH_POLL_TIMEOUT_SECONDS.
+    """
+    docs = []
+
+    for start in range(0, len(urls), FIRECRAWL_BATCH_SIZE):
+        chunk = urls[start:start + FIRECRAWL_BATCH_SIZE]
+        response = _session.post(
+            f"{FIRECRAWL_API_BASE_URL}/batch/scrape",
+            json={"urls": chunk, "formats": ["markdown"]},
+        )
+        response.raise_for_status()
+        job_id = response.json()["id"]
+
+        deadline = time.monotonic() + BATCH_POLL_TIMEOUT_SECONDS
+        while True:
+            status_response = _session.get(f"{FIRECRAWL_API_BASE_URL}/batch/scrape/{job_id}")
+            status_response.raise_for_status()
+            job = status_response.json()
+            status = job.get("status")
+            if status == "completed":
+                break
+            if status in BATCH_TERMINAL_FAILURE_STATUSES:
+                raise RuntimeError(f"FireCrawl batch scrape job {job_id} ended with status '{status}'.")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"FireCrawl batch scrape job {job_id} did not complete within {BATCH_POLL_TIMEOUT_SECONDS} seconds.")
+            time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+
+        for page in job.get("data", []):
+            docs.append(Document(page_content=page.get("markdown", "")))
+
+    return docs
 
 def get_markdown_from_documents(docs: list[Document]) -> str:
     """
@@ -45,11 +119,10 @@ def get_markdown_from_documents(docs: list[Document]) -> str:
     Returns:
         str: A string containing the combined content in markdown format.
     """
-    markdown_content = ""
+    parts = []
     for i, doc in enumerate(docs):
-        markdown_content += f"### Page {i+1}\n"
-        markdown_content += f"{doc.page_content}\n\n--------------\n\n"
-    return markdown_content
+        parts.append(f"### Page {i+1}\n{doc.page_content}\n\n--------------\n\n")
+    return "".join(parts)
 
 
 def scrape_and_get_markdown_with_firecrawl(url: str) -> str:
@@ -74,6 +147,28 @@ def scrape_and_get_markdown_with_firecrawl(url: str) -> str:
     except Exception as e:
         return f"❌ <span style='color:red;'>An error occurred while scraping with FireCrawl: {e}</span>"
 
+def scrape_and_get_markdown_batch_with_firecrawl(urls: list[str]) -> str:
+    """
+    Orchestrates a batch scrape of multiple URLs with FireCrawl and returns the content as markdown.
+
+    This is the multi-URL counterpart of scrape_and_get_markdown_with_firecrawl,
+    built on the batch scrape API so all URLs are submitted in one job.
+
+    Args:
+        urls (list[str]): The URLs of the websites to scrape.
+
+    Returns:
+        str: The scraped content in markdown format, or a formatted error message string if an issue occurs.
+    """
+    try:
+        docs = scrape_batch_with_firecrawl(urls)
+        if not docs:
+            return "❌ <span style='color:red;'>FireCrawl completed but returned no content. The pages might be empty or inaccessible.</span>"
+        markdown = get_markdown_from_documents(docs)
+        return markdown
+    except Exception as e:
+        return f"❌ <span style='color:red;'>An error occurred while scraping with FireCrawl: {e}</span>"
+
    
 
     
\ No newline at end of file
@@ -6,56 +6,41 @@ constructing the appropriate prompt for information extraction, initializing the
 selected chat model, and invoking the model to get a response.
 """
 
+import hashlib
+import re
+from functools import lru_cache
+
+import diskcache
 from langchain.chat_models import init_chat_model
+from langchain_core.messages import HumanMessage, SystemMessage
 from langfuse.langchain import CallbackHandler
-from langfuse import Langfuse
 
-from config import LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, LANGFUSE_HOST
+from tracing import get_langfuse
 
-# Initialize Langfuse client
-# This block sets up the Langfuse callback handler for LangChain.
-# It initializes the Langfuse client and creates a CallbackHandler instance
-# only if the required API keys are available. The handler is then added to
+# Set up the Langfuse callback handler for LangChain.
+# The shared Langfuse client comes from the tracing module; a CallbackHandler
+# is created only when tracing is configured. The handler is then added to
 # a list of callbacks that can be passed to LLM invocations for tracing.
 langfuse_callback_handler = None
 callbacks = []
 
-if LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY:
-    Langfuse(
-        public_key=LANGFUSE_PUBLIC_KEY,
-        secret_key=LANGFUSE_SECRET_KEY,
-        host=LANGFUSE_HOST,
-    )
+if get_langfuse():
     langfuse_callback_handler = CallbackHandler()
     callbacks.append(langfuse_callback_handler)
 
+# Computed once at import: the LangChain config carrying the tracing
+# callbacks, or None when tracing is off so hot paths skip LangChain's
+# callback-manager setup (and the per-call dict allocation) entirely.
+_INVOKE_CONFIG = {"callbacks": callbacks} if callbacks else None
 
 
-def extract_page_info_by_llm(user_query: str, scraped_markdown_content: str, model_name: str, model_provider: str) -> str:
-    """
-    Extracts information from scraped content using a specified Large Language Model.
-
-    This function constructs a detailed prompt, initializes the selected chat model,
-    and invokes it with the scraped content and user query. If Langfuse is configured,
-    it uses a callback handler to trace the LLM interaction.
-
-    Args:
-        user_query (str): The user's query specifying what information to extract.
-        scraped_markdown_content (str): The markdown content from the scraped web page.
-        model_name (str): The name of the LLM to use for extraction.
-        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
 
-    Returns:
-        str: The content of the LLM's response.
-    """
-    
-    if not scraped_markdown_content:
-        return "No relevant information found to answer your question."
-
-    context = scraped_markdown_content
-    
-    prompt = f""" 
-    You are an expert assistant who can extract useful information from the content provided to you. Most of the time, 
+# The static extraction instructions, built once at import time and sent as a
+# system message. Keeping these bytes identical across calls lets providers
+# with prompt caching reuse the prefilled prefix; only the human message with
+# the context and query varies per call.
+_SYSTEM_PROMPT = """
+    You are an expert assistant who can extract useful information from the content provided to you. Most of the time,
     the content will be from e-commerce websites, and users will ask you to extract product information like product name, price, rating, etc.
 
     **Safety Guardrails:**
@@ -63,33 +48,365 @@ def extract_page_info_by_llm(user_query: str, scraped_markdown_content: str, mod
 
     Please provide your identity (model name and provider if applicable) at the beginning of your answer.
 
-    Use the following context to answer the user's question. Provide the final answer in a markdown table format if you are asked to extract product information. 
+    Use the following context to answer the user's question. Provide the final answer in a markdown table format if you are asked to extract product information.
     If you can't extract anything useful provide in plain markdown format.
-    
+
     If user asks for JSON format, please provide the answer in JSON format only.
-    
-    User will mostly request you to extract product information but can also ask you to extract other information from the content. 
+
+    User will mostly request you to extract product information but can also ask you to extract other information from the content.
     So always read the user query carefully and extract information accordingly.
-    
+
     If you do not find or know the answer, do not hallucinate, do not try to generate fake answers.
-    If no Context is given or you can't find or generate any relevant information to answer the question, simply state "No relevant information found to answer your question.     
+    If no Context is given or you can't find or generate any relevant information to answer the question, simply state "No relevant information found to answer your question.
     If you think scraping was not done properly, **please select a different scraper (FireCrawl or Crawl4AI) from the Select Scraper Dropdown and try again.**"
-    
+
     Please do not respond with empty string / answer.
-    
-    Context: 
+    """
+
+# One SystemMessage instance shared by every call, so the static prefix stays
+# byte-identical across requests. The cache_control marker asks providers with
+# explicit prompt caching (Anthropic-style) to cache the prefix; providers
+# without it ignore the annotation, and ones with automatic prefix caching
+# (OpenAI-style) hit on the identical bytes.
+_SYSTEM_MESSAGE = SystemMessage(
+    content=_SYSTEM_PROMPT,
+    additional_kwargs={"cache_control": {"type": "ephemeral"}},
+)
+
+# The per-call parts of the prompt. Context and question are kept in separate
+# messages, with the context first: when a user asks several questions about
+# the same page, everything up to and including the context is identical
+# across calls, so providers with prompt caching only re-prefill the question.
+_CONTEXT_TEMPLATE = """
+    Context:
     {context}
+    """
 
+_QUESTION_TEMPLATE = """
     Question:
     {user_query}
-    
+
     Your Identity:
-    
+
     Answer:
-    
+
+    """
+
+
+def _build_messages(context: str, user_query: str) -> list:
+    """
+    Builds the message list for one extraction call.
+
+    The order is system instructions, then context, then question — the stable
+    parts first so provider prompt caches get the longest reusable prefix. The
+    context message carries the same ephemeral cache_control annotation as the
+    system message for providers with explicit prompt caching.
+
+    Args:
+        context (str): The cleaned, truncated scraped content.
+        user_query (str): The user's query.
+
+    Returns:
+        list: The messages to pass to the chat model.
+    """
+    return [
+        _SYSTEM_MESSAGE,
+        HumanMessage(
+            content=_CONTEXT_TEMPLATE.format(context=context),
+            additional_kwargs={"cache_control": {"type": "ephemeral"}},
+        ),
+        HumanMessage(content=_QUESTION_TEMPLATE.format(user_query=user_query)),
+    ]
+
+# Upper bound on how much scraped markdown is embedded into the prompt.
+# Prefill latency and cost grow linearly with input size, and very large pages
+# can exceed provider context windows entirely.
+MAX_CONTEXT_CHARS = 60000
+
+
+# Lines that are nothing but a markdown link bullet — typically nav menus,
+# footers, and "related products" lists that add tokens but no signal.
+_LINK_ONLY_LINE = re.compile(r"^\s*[-*]?\s*\[.*?\]\(.*?\)\s*$", flags=re.M)
+_EXCESS_NEWLINES = re.compile(r"\n{3,}")
+
+
+def _clean_markdown(markdown_content: str) -> str:
+    """
+    Strips boilerplate from scraped markdown before it reaches the prompt.
+
+    Drops link-only lines (navigation menus, footers), collapses runs of blank
+    lines, and removes consecutive duplicate lines, reducing the token count
+    without losing page content.
+
+    Args:
+        markdown_content (str): The raw scraped markdown content.
+
+    Returns:
+        str: The cleaned markdown content.
+    """
+    cleaned = _LINK_ONLY_LINE.sub("", markdown_content)
+    cleaned = _EXCESS_NEWLINES.sub("\n\n", cleaned)
+
+    deduped_lines = []
+    previous_line = None
+    for line in cleaned.splitlines():
+        if line.strip() and line == previous_line:
+            continue
+        deduped_lines.append(line)
+        previous_line = line
+    return "\n".join(deduped_lines).strip()
+
+
+def _truncate_context(markdown_content: str) -> str:
+    """
+    Truncates overly long scraped content to MAX_CONTEXT_CHARS.
+
+    Keeps the head and tail of the page (where titles, product details, and
+    summaries usually live) and drops the middle, marking the cut explicitly.
+
+    Args:
+        markdown_content (str): The scraped markdown content.
+
+    Returns:
+        str: The content, truncated with a marker if it exceeded the limit.
+    """
+    if len(markdown_content) <= MAX_CONTEXT_CHARS:
+        return markdown_content
+    half = MAX_CONTEXT_CHARS // 2
+    return markdown_content[:half] + "\n...[truncated]...\n" + markdown_content[-half:]
+
+
+# Upper bound on how many prompts llm.batch dispatches to the provider at once.
+MAX_BATCH_CONCURRENCY = 16
+
+# Default cap on output tokens. Decode time and cost scale linearly with
+# output length, so an uncapped confused model can ramble for thousands of
+# tokens; this bounds the worst case without affecting typical answers.
+DEFAULT_MAX_OUTPUT_TOKENS = 512
+
+# Stop generation if the model starts hallucinating additional conversation
+# turns in the shape of the prompt scaffolding.
+_STOP_SEQUENCES = ["\n\nQuestion:", "\n\nContext:"]
+
+# Output-length bins (in tokens) used to group batched requests. Mixing short
+# and long generations in one batch makes the whole batch wait for the longest
+# sequence on server-side batching backends, so each bin is dispatched
+# separately with its own max_tokens cap.
+SHORT_OUTPUT_TOKENS = 128
+MEDIUM_OUTPUT_TOKENS = 256
+LONG_OUTPUT_TOKENS = 512
+
+# Query keywords suggesting a long free-form answer vs. a short field lookup.
+_LONG_ANSWER_KEYWORDS = ("summarize", "summary", "describe", "explain", "compare", "json")
+_SHORT_ANSWER_KEYWORDS = ("price", "name", "rating", "title", "count", "how many")
+
+
+def _expected_max_tokens(user_query: str) -> int:
+    """
+    Estimates a max_tokens cap for a query based on what it asks for.
+
+    Field lookups ("find the price") need far fewer output tokens than
+    free-form requests ("summarize this page"); everything else gets the
+    medium bin.
+
+    Args:
+        user_query (str): The user's query.
+
+    Returns:
+        int: The expected output-length cap in tokens.
+    """
+    query = user_query.lower()
+    if any(keyword in query for keyword in _LONG_ANSWER_KEYWORDS):
+        return LONG_OUTPUT_TOKENS
+    if any(keyword in query for keyword in _SHORT_ANSWER_KEYWORDS):
+        return SHORT_OUTPUT_TOKENS
+    return MEDIUM_OUTPUT_TOKENS
+
+# Completed LLM responses keyed by a hash of (model, provider, query, content),
+# so re-running an identical extraction skips the API round-trip entirely.
+# Stored on disk so hits survive app restarts; diskcache is thread-safe.
+_response_cache = diskcache.Cache("./.llm_cache")
+
+
+def _response_cache_key(user_query: str, scraped_markdown_content: str, model_name: str, model_provider: str) -> str:
+    """
+    Builds the response-cache key for one extraction request.
+
+    Args:
+        user_query (str): The user's query specifying what information to extract.
+        scraped_markdown_content (str): The markdown content from the scraped web page.
+        model_name (str): The name of the LLM to use for extraction.
+        model_provider (str): The provider of the LLM.
+
+    Returns:
+        str: A SHA256 hex digest identifying the request.
+    """
+    raw = f"{model_name}|{model_provider}|{user_query}|{scraped_markdown_content}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _get_llm(model_name: str, model_provider: str, max_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS):
+    """
+    Returns a chat model for the given name and provider, constructing it once.
+
+    Caching the model keeps its underlying HTTP client (and its keep-alive
+    connections) warm across calls instead of re-bootstrapping per query.
+    Temperature is pinned to 0 so extraction is deterministic — which also
+    keeps provider prompt-cache hit rates up.
+
+    Args:
+        model_name (str): The name of the LLM to initialize.
+        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
+        max_tokens (int): Cap on output tokens. Defaults to DEFAULT_MAX_OUTPUT_TOKENS.
+
+    Returns:
+        BaseChatModel: The initialized chat model instance.
+    """
+    return init_chat_model(model_name, model_provider=model_provider, max_tokens=max_tokens, temperature=0.0)
+
+
+def extract_page_info_by_llm_stream(user_query: str, scraped_markdown_content: str, model_name: str, model_provider: str):
+    """
+    Extracts information from scraped content using a specified Large Language Model, streaming the response.
+
+    This generator constructs a detailed prompt, initializes the selected chat model,
+    and streams the model's response chunk by chunk, so callers can render tokens
+    as they arrive instead of waiting for the full completion. If Langfuse is
+    configured, it uses a callback handler to trace the LLM interaction.
+
+    Args:
+        user_query (str): The user's query specifying what information to extract.
+        scraped_markdown_content (str): The markdown content from the scraped web page.
+        model_name (str): The name of the LLM to use for extraction.
+        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
+
+    Yields:
+        str: Successive chunks of the LLM's response content.
     """
-    
-    llm = init_chat_model(model_name, model_provider=model_provider)
-    response = llm.invoke(prompt, config={"callbacks": callbacks})
+
+    if not scraped_markdown_content:
+        yield "No relevant information found to answer your question."
+        return
+
+    cache_key = _response_cache_key(user_query, scraped_markdown_content, model_name, model_provider)
+    cached_response = _response_cache.get(cache_key)
+    if cached_response is not None:
+        yield cached_response
+        return
+
+    context = _truncate_context(_clean_markdown(scraped_markdown_content))
+
+    messages = _build_messages(context, user_query)
+
+    llm = _get_llm(model_name, model_provider)
+    # Only pass a config when a tracing handler is registered; with an empty
+    # callback list LangChain would still run its callback-manager machinery.
+    invoke_kwargs = {"config": _INVOKE_CONFIG} if _INVOKE_CONFIG else {}
+    chunks = []
+    for chunk in llm.stream(messages, stop=_STOP_SEQUENCES, **invoke_kwargs):
+        chunks.append(chunk.content)
+        yield chunk.content
+
+    response_text = "".join(chunks)
+    if response_text.strip():
+        _response_cache[cache_key] = response_text
+
+
+def extract_page_info_by_llm(user_query: str, scraped_markdown_content: str, model_name: str, model_provider: str) -> str:
+    """
+    Extracts information from scraped content using a specified Large Language Model.
+
+    This is the buffered counterpart of extract_page_info_by_llm_stream for
+    callers that want the complete response as a single string.
+
+    Args:
+        user_query (str): The user's query specifying what information to extract.
+        scraped_markdown_content (str): The markdown content from the scraped web page.
+        model_name (str): The name of the LLM to use for extraction.
+        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
+
+    Returns:
+        str: The content of the LLM's response.
+    """
+    return "".join(extract_page_info_by_llm_stream(user_query, scraped_markdown_content, model_name, model_provider))
+
+
+async def extract_page_info_by_llm_async(user_query: str, scraped_markdown_content: str, model_name: str, model_provider: str) -> str:
+    """
+    Asynchronously extracts information from scraped content using a specified Large Language Model.
+
+    This is the awaitable counterpart of extract_page_info_by_llm, built on
+    llm.ainvoke so concurrent extractions overlap their network I/O on one
+    event loop (e.g. via asyncio.gather) instead of tying up worker threads.
+
+    Args:
+        user_query (str): The user's query specifying what information to extract.
+        scraped_markdown_content (str): The markdown content from the scraped web page.
+        model_name (str): The name of the LLM to use for extraction.
+        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
+
+    Returns:
+        str: The content of the LLM's response.
+    """
+    if not scraped_markdown_content:
+        return "No relevant information found to answer your question."
+
+    cache_key = _response_cache_key(user_query, scraped_markdown_content, model_name, model_provider)
+    cached_response = _response_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+
+    context = _truncate_context(_clean_markdown(scraped_markdown_content))
+
+    messages = _build_messages(context, user_query)
+
+    llm = _get_llm(model_name, model_provider)
+    invoke_kwargs = {"config": _INVOKE_CONFIG} if _INVOKE_CONFIG else {}
+    response = await llm.ainvoke(messages, stop=_STOP_SEQUENCES, **invoke_kwargs)
+
+    if response.content and response.content.strip():
+        _response_cache[cache_key] = response.content
     return response.content
+
+
+def extract_page_info_by_llm_batch(queries: list[tuple[str, str]], model_name: str, model_provider: str) -> list[str]:
+    """
+    Extracts information for multiple (query, content) pairs in one batched LLM call.
+
+    Prompts are dispatched concurrently through llm.batch, which lets providers
+    with server-side batching process them together instead of serializing N
+    network round-trips. Requests are first grouped into output-length bins
+    (estimated from each query) and each bin is sent with its own max_tokens
+    cap, so short field lookups don't wait on long summaries.
+
+    Args:
+        queries (list[tuple[str, str]]): Pairs of (user_query, scraped_markdown_content).
+        model_name (str): The name of the LLM to use for extraction.
+        model_provider (str): The provider of the LLM (e.g., 'google_genai', 'nvidia').
+
+    Returns:
+        list[str]: The LLM's response content for each pair, in input order.
+    """
+    if not queries:
+        return []
+
+    prompts = []
+    bins = {}
+    for index, (user_query, scraped_markdown_content) in enumerate(queries):
+        context = _truncate_context(_clean_markdown(scraped_markdown_content))
+        prompts.append(_build_messages(context, user_query))
+        bins.setdefault(_expected_max_tokens(user_query), []).append(index)
+
+    config = {"max_concurrency": MAX_BATCH_CONCURRENCY}
+    if callbacks:
+        config["callbacks"] = callbacks
+
+    results = [""] * len(queries)
+    for bin_cap, indices in bins.items():
+        llm = _get_llm(model_name, model_provider, max_tokens=bin_cap)
+        responses = llm.batch([prompts[i] for i in indices], config=config, stop=_STOP_SEQUENCES)
+        for index, response in zip(indices, responses):
+            results[index] = response.content
+    return results
     
\ No newline at end of file
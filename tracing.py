@@ -0,0 +1,48 @@
+"""
+This module provides the single shared Langfuse client for the application.
+
+Previously both the Gradio app and the LLM inference service constructed their
+own Langfuse client at import time, which meant two HTTP connection pools and
+duplicate background span flushers. All modules now obtain the one shared
+client (or None when tracing is not configured) from get_langfuse().
+"""
+
+import atexit
+
+import httpx
+from langfuse import Langfuse, get_client
+
+from config import LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, LANGFUSE_HOST
+
+_client = None
+
+
+def get_langfuse():
+    """
+    Returns the shared Langfuse client, initializing it on first use.
+
+    The client is configured for batched span export (flush_at/flush_interval)
+    so traces are sent off the request path, and a final flush is registered
+    for interpreter shutdown.
+
+    Returns:
+        Langfuse | None: The shared client, or None if the Langfuse keys are not set.
+    """
+    global _client
+    if _client is None and LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY:
+        Langfuse(
+            public_key=LANGFUSE_PUBLIC_KEY,
+            secret_key=LANGFUSE_SECRET_KEY,
+            host=LANGFUSE_HOST,
+            flush_at=50,
+            flush_interval=5.0,
+            # One pooled HTTP/2 connection for all span uploads, instead of a
+            # fresh HTTP/1.1 connection per flush.
+            httpx_client=httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+            ),
+        )
+        _client = get_client()
+        atexit.register(_client.flush)
+    return _client